@@ -1,18 +1,23 @@
 # app.py
 import asyncio
+import mimetypes
 import os
+import time
 
-from flask import Flask, request, jsonify, send_from_directory, render_template, session
+from flask import Flask, Response, request, jsonify, session
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from ai import responder
 from tts import gerar_audio
-from db import init_db, SessionLocal, User, Chat, Message
+from audio_storage import storage
+from idempotency import body_hash, make_key, run_once
+from assets import init_assets, render_page
+from db import init_db, SessionLocal, ReadSessionLocal, has_replicas, User, Chat, Message
+from archive import is_archived, rehydrate_chat, start_archiver
 
 app = Flask(__name__)
-os.makedirs("audios", exist_ok=True)
 
 # No Render/Prod: crie env FLASK_SECRET_KEY com algo forte
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-secret-nao-use-em-prod")
@@ -20,6 +25,10 @@ app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-secret-nao-use-em-prod")
 # Render/Reverse proxy: garante que Flask entenda HTTPS
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+# após uma escrita, leituras desse usuário ficam no primário por N segundos
+# (read-your-writes enquanto a réplica ainda não alcançou)
+READ_AFTER_WRITE_SECONDS = int(os.getenv("READ_AFTER_WRITE_SECONDS", "10"))
+
 # cookies da sessão
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
@@ -28,14 +37,39 @@ app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
 if os.getenv("RENDER") or os.getenv("RENDER_EXTERNAL_URL"):
     app.config["SESSION_COOKIE_SECURE"] = True
 
+# static com hash no nome + compressão gzip/brotli
+init_assets(app)
+
 # cria tabelas se não existir
 init_db()
 
+# job de fundo: partições do mês, arquivamento de chats inativos e expiração de áudios
+start_archiver()
+
 
 def get_db():
     return SessionLocal()
 
 
+def get_read_db():
+    # acabou de escrever: lê do primário pra não ver dado velho da réplica
+    if session.get("primary_until", 0) > time.time():
+        return get_db()
+    return ReadSessionLocal()
+
+
+def stick_to_primary():
+    if has_replicas():
+        session["primary_until"] = time.time() + READ_AFTER_WRITE_SECONDS
+
+
+@app.after_request
+def _read_your_writes(resp):
+    if request.method in ("POST", "PUT", "DELETE") and resp.status_code < 400:
+        stick_to_primary()
+    return resp
+
+
 # =========================
 # HELPERS
 # =========================
@@ -57,20 +91,20 @@ def get_current_user(db):
 
 @app.route("/")
 def home():
-    return render_template("index.html")
+    return render_page("index.html")
 
 
 @app.route("/login")
 def login_page():
-    return render_template("login.html")
+    return render_page("login.html")
 
 
 @app.route("/account")
 def account_page():
     # página protegida
     if not require_login():
-        return render_template("login.html")
-    return render_template("account.html")
+        return render_page("login.html")
+    return render_page("account.html")
 
 
 # =========================
@@ -83,9 +117,15 @@ def auth_me():
     if not uid:
         return jsonify({"logged": False}), 401
 
-    db = get_db()
+    db = get_read_db()
     try:
         u = db.query(User).filter(User.id == int(uid)).first()
+        if not u and db.info.get("read_only"):
+            # réplica atrasada não pode derrubar o login: confirma no primário
+            db.close()
+            db = get_db()
+            u = db.query(User).filter(User.id == int(uid)).first()
+
         if not u:
             session.pop("user_id", None)
             return jsonify({"logged": False}), 401
@@ -318,7 +358,7 @@ def list_chats():
     if not uid:
         return jsonify({"error": "não autenticado"}), 401
 
-    db = get_db()
+    db = get_read_db()
     try:
         chats = (
             db.query(Chat)
@@ -340,12 +380,26 @@ def chat_messages(chat_id: int):
     if not uid:
         return jsonify({"error": "não autenticado"}), 401
 
-    db = get_db()
+    db = get_read_db()
     try:
         chat = db.query(Chat).filter(Chat.id == chat_id).first()
+        if not chat and db.info.get("read_only"):
+            # réplica atrasada (chat recém-criado): confirma no primário antes do 404
+            db.close()
+            db = get_db()
+            chat = db.query(Chat).filter(Chat.id == chat_id).first()
+
         if not chat or chat.user_id != int(uid):
             return jsonify({"error": "chat não encontrado"}), 404
 
+        # chat inativo arquivado: volta pro messages antes de listar
+        # (reidratar é escrita, então passa pro primário e lê de lá)
+        if is_archived(db, chat_id):
+            db.close()
+            db = get_db()
+            rehydrate_chat(db, chat_id)
+            stick_to_primary()
+
         msgs = (
             db.query(Message)
             .filter(Message.chat_id == chat_id)
@@ -376,13 +430,29 @@ def chat():
     if not chat_id:
         return jsonify({"error": "chat_id é obrigatório"}), 400
 
+    # retry do navegador / duplo clique: reaproveita o resultado em vez de
+    # salvar a msg de novo e gastar outra chamada de IA + TTS
+    client_key = request.headers.get("Idempotency-Key") or data.get("request_id")
+    key = make_key(int(uid), chat_id, msg, client_key)
+
+    payload, status = run_once(
+        key,
+        body_hash(chat_id, msg),
+        lambda: _process_chat(int(uid), int(chat_id), msg)
+    )
+    return jsonify(payload), status
+
+
+def _process_chat(uid: int, chat_id: int, msg: str):
     db = get_db()
     try:
-        chat_obj = db.query(Chat).filter(Chat.id == int(chat_id)).first()
-        if not chat_obj or chat_obj.user_id != int(uid):
-            return jsonify({"error": "chat não encontrado"}), 404
+        chat_obj = db.query(Chat).filter(Chat.id == chat_id).first()
+        if not chat_obj or chat_obj.user_id != uid:
+            return {"error": "chat não encontrado"}, 404
 
-        u = db.query(User).filter(User.id == int(uid)).first()
+        rehydrate_chat(db, chat_id)
+
+        u = db.query(User).filter(User.id == uid).first()
         user_profile = None
         if u:
             user_profile = {
@@ -393,13 +463,13 @@ def chat():
             }
 
         # salva msg user
-        db.add(Message(chat_id=int(chat_id), role="user", content=msg))
+        db.add(Message(chat_id=chat_id, role="user", content=msg))
         db.commit()
 
         # histórico (últimas 30)
         last_msgs = (
             db.query(Message)
-            .filter(Message.chat_id == int(chat_id))
+            .filter(Message.chat_id == chat_id)
             .order_by(Message.created_at.asc())
             .all()
         )[-30:]
@@ -410,7 +480,7 @@ def chat():
         texto = responder(msg, history=history, user_profile=user_profile, html=True)
 
         # salva resposta
-        db.add(Message(chat_id=int(chat_id), role="assistant", content=texto))
+        db.add(Message(chat_id=chat_id, role="assistant", content=texto))
         db.commit()
 
     finally:
@@ -424,7 +494,7 @@ def chat():
     except:
         audio_url = None
 
-    return jsonify({"text": texto, "audio": audio_url})
+    return {"text": texto, "audio": audio_url}, 200
 
 
 @app.route("/chats/<int:chat_id>", methods=["PUT"])
@@ -478,14 +548,18 @@ def delete_chat(chat_id):
 @app.route("/audio/<nome>")
 def audio(nome):
     safe = secure_filename(nome)
-    return send_from_directory("audios", safe)
+    data = storage.get(safe)
+    if data is None:
+        return {"ok": False}, 404
+
+    # Range (206) exige complete_length; o <audio> do Safari/iOS pede por partes
+    resp = Response(data, mimetype=mimetypes.guess_type(safe)[0] or "application/octet-stream")
+    return resp.make_conditional(request, accept_ranges=True, complete_length=len(data))
 
 
 @app.route("/audio/<nome>/delete", methods=["DELETE"])
 def delete_audio(nome):
     safe = secure_filename(nome)
-    try:
-        os.remove(os.path.join("audios", safe))
+    if storage.delete(safe):
         return {"ok": True}
-    except FileNotFoundError:
-        return {"ok": False}, 404
+    return {"ok": False}, 404
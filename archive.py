@@ -0,0 +1,191 @@
+# archive.py
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import aliased
+
+from audio_storage import AUDIO_PURGE_INTERVAL, maybe_purge
+from db import (
+    SessionLocal,
+    Message,
+    ArchivedChat,
+    drop_empty_partitions,
+    ensure_message_partitions,
+    engine
+)
+
+# Chats sem mensagem nova há N dias vão pro cold store (0 desliga;
+# a manutenção das partições continua rodando)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+# Intervalo (s) entre execuções do job
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+# Máximo de chats arquivados por execução (transação curta)
+ARCHIVE_BATCH = int(os.getenv("ARCHIVE_BATCH", "100"))
+
+# Chave do advisory lock: só um worker/instância arquiva por vez
+_ARCHIVE_LOCK_KEY = 7262001
+
+log = logging.getLogger(__name__)
+
+
+def _pack(data) -> bytes:
+    return gzip.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _unpack(payload: bytes):
+    return json.loads(gzip.decompress(payload).decode("utf-8"))
+
+
+def archive_inactive_chats(days: int = ARCHIVE_AFTER_DAYS, limit: int = ARCHIVE_BATCH) -> int:
+    """
+    Move as mensagens de chats inativos pro cold store (archived_chats).
+    Retorna quantos chats foram arquivados.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    db = SessionLocal()
+    try:
+        if engine.dialect.name == "postgresql":
+            got = db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _ARCHIVE_LOCK_KEY}
+            ).scalar()
+            if not got:
+                return 0
+
+        # só olha linhas antes do cutoff (poda as partições recentes) e descarta
+        # chats com msg depois dele via NOT EXISTS no índice (chat_id, created_at)
+        recente = aliased(Message)
+        tem_recente = (
+            db.query(recente.id)
+            .filter(recente.chat_id == Message.chat_id, recente.created_at >= cutoff)
+            .exists()
+        )
+        inativos = (
+            db.query(Message.chat_id, func.max(Message.created_at))
+            .filter(Message.created_at < cutoff, ~tem_recente)
+            .group_by(Message.chat_id)
+            .limit(limit)
+            .all()
+        )
+
+        arquivados = 0
+        for chat_id, last_at in inativos:
+            # chegou msg depois do GROUP BY: chat voltou a ficar ativo, não mexe
+            nova = (
+                db.query(Message.id)
+                .filter(Message.chat_id == chat_id, Message.created_at > last_at)
+                .first()
+            )
+            if nova:
+                continue
+
+            msgs = (
+                db.query(Message)
+                .filter(Message.chat_id == chat_id, Message.created_at <= last_at)
+                .order_by(Message.created_at.asc())
+                .all()
+            )
+            if not msgs:
+                continue
+
+            data = [
+                {"role": m.role, "content": m.content, "created_at": m.created_at.isoformat()}
+                for m in msgs
+            ]
+
+            arq = db.query(ArchivedChat).filter(ArchivedChat.chat_id == chat_id).first()
+            if arq:
+                # sobrou arquivo de antes: junta tudo num payload só
+                data = _unpack(arq.payload) + data
+                arq.payload = _pack(data)
+                arq.message_count = len(data)
+                arq.last_message_at = last_at
+                arq.archived_at = datetime.utcnow()
+            else:
+                db.add(ArchivedChat(
+                    chat_id=chat_id,
+                    payload=_pack(data),
+                    message_count=len(data),
+                    last_message_at=last_at,
+                ))
+
+            # apaga só o que foi empacotado (por id)
+            ids = [m.id for m in msgs]
+            db.query(Message).filter(Message.id.in_(ids)).delete(synchronize_session=False)
+            arquivados += 1
+
+        db.commit()
+        return arquivados
+    finally:
+        db.close()
+
+
+def is_archived(db, chat_id: int) -> bool:
+    return db.query(ArchivedChat.chat_id).filter(ArchivedChat.chat_id == chat_id).first() is not None
+
+
+def rehydrate_chat(db, chat_id: int) -> bool:
+    """
+    Se o chat está arquivado, devolve as mensagens pra `messages`.
+    Chamado ao abrir o chat; é só uma busca por PK quando não há arquivo.
+    """
+    arq = (
+        db.query(ArchivedChat)
+        .filter(ArchivedChat.chat_id == chat_id)
+        .with_for_update()
+        .first()
+    )
+    if not arq:
+        return False
+
+    for m in _unpack(arq.payload):
+        db.add(Message(
+            chat_id=chat_id,
+            role=m["role"],
+            content=m["content"],
+            created_at=datetime.fromisoformat(m["created_at"]),
+        ))
+
+    db.delete(arq)
+    db.commit()
+    return True
+
+
+def _loop():
+    ultimo_archive = 0.0
+    while True:
+        # expiração de áudios (fora do POST /chat; tem intervalo próprio)
+        maybe_purge()
+
+        if time.time() - ultimo_archive >= ARCHIVE_INTERVAL:
+            ultimo_archive = time.time()
+
+            # partições do mês seguem sendo criadas mesmo com arquivamento desligado
+            try:
+                ensure_message_partitions()
+            except Exception:
+                # job de fundo nunca pode derrubar o app
+                log.exception("falha criando partições de messages")
+
+            if ARCHIVE_AFTER_DAYS > 0:
+                try:
+                    archive_inactive_chats()
+                    # mês com todos os chats arquivados: remove a partição inteira
+                    drop_empty_partitions(datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS))
+                except Exception:
+                    log.exception("falha no arquivamento de chats")
+
+        time.sleep(min(ARCHIVE_INTERVAL, AUDIO_PURGE_INTERVAL))
+
+
+def start_archiver():
+    t = threading.Thread(target=_loop, name="archiver", daemon=True)
+    t.start()
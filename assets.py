@@ -0,0 +1,166 @@
+# assets.py
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import Response, abort, current_app, render_template, request
+
+try:
+    import brotli  # opcional: pip install brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Respostas menores que isso não compensam comprimir
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = 6
+
+COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "application/javascript",
+    "text/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+# Arquivos com hash no nome nunca mudam: cache "eterno" no navegador
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+class _Blob:
+    """Bytes prontos pra servir + versões pré-comprimidas."""
+
+    def __init__(self, raw: bytes, mimetype: str):
+        self.raw = raw
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(raw).hexdigest()[:16]
+        self.gzip = gzip.compress(raw, COMPRESS_LEVEL)
+        self.br = brotli.compress(raw) if brotli else None
+
+    def pick(self) -> Tuple[bytes, Optional[str]]:
+        enc = _accepted_encoding(len(self.raw))
+        if enc == "br" and self.br is not None:
+            return self.br, "br"
+        if enc == "gzip":
+            return self.gzip, "gzip"
+        return self.raw, None
+
+
+# "css/index.css" -> _Blob / "css/index.<hash>.css" -> "css/index.css"
+_assets: Dict[str, _Blob] = {}
+_fingerprints: Dict[str, str] = {}
+_pages: Dict[str, _Blob] = {}
+
+
+def _accepted_encoding(size: int) -> Optional[str]:
+    if size < COMPRESS_MIN_SIZE:
+        return None
+    # best_match respeita q-values (gzip;q=0 = não aceita); empate fica com br
+    opcoes = ["br", "gzip"] if brotli else ["gzip"]
+    return request.accept_encodings.best_match(opcoes)
+
+
+def _fingerprinted(path: str, digest: str) -> str:
+    base, ext = os.path.splitext(path)
+    return f"{base}.{digest[:10]}{ext}"
+
+
+def _load_asset(path: str) -> Optional[_Blob]:
+    blob = _assets.get(path)
+    if blob is not None:
+        return blob
+
+    full = os.path.normpath(os.path.join(STATIC_DIR, path))
+    if not full.startswith(STATIC_DIR + os.sep) or not os.path.isfile(full):
+        return None
+
+    with open(full, "rb") as f:
+        raw = f.read()
+
+    mimetype = mimetypes.guess_type(full)[0] or "application/octet-stream"
+    blob = _Blob(raw, mimetype)
+    _assets[path] = blob
+    _fingerprints[_fingerprinted(path, blob.etag)] = path
+    return blob
+
+
+def asset_url(path: str) -> str:
+    """URL com hash do conteúdo (usada nos templates)."""
+    blob = _load_asset(path)
+    if blob is None:
+        return f"/static/{path}"
+    return "/assets/" + _fingerprinted(path, blob.etag)
+
+
+def _send(blob: _Blob, cache_control: str) -> Response:
+    body, enc = blob.pick()
+    resp = Response(body, mimetype=blob.mimetype)
+    if enc:
+        resp.headers["Content-Encoding"] = enc
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = cache_control
+    resp.set_etag(blob.etag + ("-" + enc if enc else ""))
+    return resp.make_conditional(request)
+
+
+def render_page(template: str) -> Response:
+    """
+    Renderiza o HTML uma vez por processo e serve os bytes (já comprimidos).
+    As páginas não têm dados do usuário (tudo vem via /auth/me etc).
+    """
+    blob = _pages.get(template)
+    if blob is None or current_app.debug:
+        html = render_template(template).encode("utf-8")
+        blob = _Blob(html, "text/html")
+        _pages[template] = blob
+    return _send(blob, "no-cache")
+
+
+def serve_asset(nome: str):
+    path = _fingerprints.get(nome)
+    if path is None:
+        abort(404)
+    return _send(_assets[path], IMMUTABLE_CACHE)
+
+
+def compress_response(resp: Response) -> Response:
+    """after_request: gzip/brotli nas respostas dinâmicas (JSON etc)."""
+    if resp.direct_passthrough or resp.status_code != 200:
+        return resp
+    if "Content-Encoding" in resp.headers:
+        return resp
+    if resp.mimetype not in COMPRESSIBLE_TYPES:
+        return resp
+
+    data = resp.get_data()
+    enc = _accepted_encoding(len(data))
+    if enc is None:
+        return resp
+
+    if enc == "br":
+        resp.set_data(brotli.compress(data))
+    else:
+        resp.set_data(gzip.compress(data, COMPRESS_LEVEL))
+    resp.headers["Content-Encoding"] = enc
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def _preload():
+    # carrega tudo no boot: /assets/<hash> funciona antes de qualquer página renderizar
+    for root, _, files in os.walk(STATIC_DIR):
+        for f in files:
+            rel = os.path.relpath(os.path.join(root, f), STATIC_DIR)
+            _load_asset(rel.replace(os.sep, "/"))
+
+
+def init_assets(app):
+    _preload()
+    app.add_template_global(asset_url)
+    app.add_url_rule("/assets/<path:nome>", "assets", serve_asset)
+    app.after_request(compress_response)
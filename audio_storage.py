@@ -0,0 +1,208 @@
+# audio_storage.py
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+try:
+    import boto3  # opcional: só pro backend s3
+except ImportError:
+    boto3 = None
+
+# local | shared | s3
+AUDIO_STORAGE = os.getenv("AUDIO_STORAGE", "local").strip().lower()
+
+# Por quanto tempo (s) um áudio fica disponível antes de expirar
+AUDIO_TTL = int(os.getenv("AUDIO_TTL", "3600"))
+
+# Intervalo mínimo (s) entre varreduras de expiração
+AUDIO_PURGE_INTERVAL = int(os.getenv("AUDIO_PURGE_INTERVAL", "300"))
+
+
+class AudioStorage:
+    """
+    Interface dos backends de áudio.
+    nome: só o nome do arquivo (já passado por secure_filename nas rotas)
+    """
+
+    def put_file(self, nome: str, caminho: str) -> None:
+        """Move o arquivo temporário `caminho` pro storage como `nome`."""
+        raise NotImplementedError
+
+    def get(self, nome: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def delete(self, nome: str) -> bool:
+        """True se apagou, False se não existia."""
+        raise NotImplementedError
+
+    def purge_expired(self, ttl: int) -> int:
+        """Apaga áudios mais velhos que ttl segundos. Retorna quantos apagou."""
+        raise NotImplementedError
+
+
+class LocalStorage(AudioStorage):
+    """Diretório local do processo (uma instância só)."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _path(self, nome: str) -> str:
+        return os.path.join(self.base_dir, nome)
+
+    def put_file(self, nome: str, caminho: str) -> None:
+        # shutil.move: o temp pode estar em outro filesystem
+        shutil.move(caminho, self._path(nome))
+
+    def get(self, nome: str) -> Optional[bytes]:
+        try:
+            with open(self._path(nome), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, nome: str) -> bool:
+        try:
+            os.remove(self._path(nome))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def purge_expired(self, ttl: int) -> int:
+        limite = time.time() - ttl
+        apagados = 0
+        for nome in os.listdir(self.base_dir):
+            caminho = self._path(nome)
+            try:
+                if os.path.isfile(caminho) and os.path.getmtime(caminho) < limite:
+                    os.remove(caminho)
+                    apagados += 1
+            except FileNotFoundError:
+                # outra instância apagou primeiro
+                pass
+        return apagados
+
+
+class SharedFSStorage(LocalStorage):
+    """
+    Diretório compartilhado entre instâncias (NFS, EFS, disco do Render...).
+    Escreve em arquivo temporário no mesmo diretório e renomeia, pra outra
+    instância nunca ler um áudio pela metade.
+    """
+
+    def put_file(self, nome: str, caminho: str) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.base_dir, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.move(caminho, tmp)
+            os.replace(tmp, self._path(nome))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+class S3Storage(AudioStorage):
+    """
+    Bucket S3 ou compatível (MinIO, R2...).
+    endpoint_url permite apontar pra um stand-in local (ex: MinIO em localhost).
+    """
+
+    def __init__(self, bucket: str, prefix: str = "audios/", endpoint_url: Optional[str] = None, client=None):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("AUDIO_STORAGE=s3 precisa do pacote boto3")
+            client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, nome: str) -> str:
+        return self.prefix + nome
+
+    def put_file(self, nome: str, caminho: str) -> None:
+        try:
+            self.client.upload_file(caminho, self.bucket, self._key(nome))
+        finally:
+            os.remove(caminho)
+
+    def get(self, nome: str) -> Optional[bytes]:
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self._key(nome))
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return obj["Body"].read()
+
+    def delete(self, nome: str) -> bool:
+        # delete_object não reclama de chave inexistente, então checa antes
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(nome))
+        except self.client.exceptions.ClientError as e:
+            # só "não existe" vira 404; AccessDenied, throttling etc sobem
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(nome))
+        return True
+
+    def purge_expired(self, ttl: int) -> int:
+        limite = time.time() - ttl
+        apagados = 0
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            velhos = [
+                {"Key": o["Key"]}
+                for o in page.get("Contents", [])
+                if o["LastModified"].timestamp() < limite
+            ]
+            if velhos:
+                self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": velhos})
+                apagados += len(velhos)
+        return apagados
+
+
+def create_storage() -> AudioStorage:
+    if AUDIO_STORAGE == "local":
+        return LocalStorage(os.getenv("AUDIO_DIR", "audios"))
+
+    if AUDIO_STORAGE == "shared":
+        shared_dir = os.getenv("AUDIO_SHARED_DIR")
+        if not shared_dir:
+            raise RuntimeError("AUDIO_STORAGE=shared precisa de AUDIO_SHARED_DIR")
+        return SharedFSStorage(shared_dir)
+
+    if AUDIO_STORAGE == "s3":
+        bucket = os.getenv("AUDIO_S3_BUCKET")
+        if not bucket:
+            raise RuntimeError("AUDIO_STORAGE=s3 precisa de AUDIO_S3_BUCKET")
+        return S3Storage(
+            bucket,
+            prefix=os.getenv("AUDIO_S3_PREFIX", "audios/"),
+            endpoint_url=os.getenv("AUDIO_S3_ENDPOINT_URL"),
+        )
+
+    raise RuntimeError(f"AUDIO_STORAGE inválido: {AUDIO_STORAGE}")
+
+
+storage = create_storage()
+
+_last_purge = 0.0
+
+
+def maybe_purge():
+    """
+    Expira áudios antigos, no máximo uma vez a cada AUDIO_PURGE_INTERVAL.
+    Roda no job de fundo (archive.py), nunca dentro de uma requisição.
+    """
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < AUDIO_PURGE_INTERVAL:
+        return
+    _last_purge = now
+    try:
+        storage.purge_expired(AUDIO_TTL)
+    except Exception:
+        # limpeza nunca pode derrubar o job de fundo
+        pass
@@ -1,17 +1,28 @@
 # db.py
+import itertools
+import logging
 import os
+import re
+import threading
+import time
 from datetime import datetime
 
 from sqlalchemy import (
     create_engine,
+    inspect,
+    text,
     Column,
     Integer,
     String,
     Text,
     DateTime,
-    ForeignKey
+    LargeBinary,
+    ForeignKey,
+    Index,
+    event
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
 
 # =========================
 # DB URL (Render / Postgres)
@@ -21,21 +32,160 @@ DB_URL = os.getenv("DATABASE_URL")
 if not DB_URL:
     raise RuntimeError("DATABASE_URL não configurada (Render env var)")
 
-# Render usa postgres://, SQLAlchemy exige postgresql://
-if DB_URL.startswith("postgres://"):
-    DB_URL = DB_URL.replace("postgres://", "postgresql://", 1)
+
+def _fix_url(url: str) -> str:
+    # Render usa postgres://, SQLAlchemy exige postgresql://
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+DB_URL = _fix_url(DB_URL)
+
+# Réplicas de leitura (opcional): URLs separadas por vírgula
+REPLICA_URLS = [
+    _fix_url(u.strip())
+    for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if u.strip()
+]
+
+# Réplica com erro fica fora por esse tempo (s) antes de tentar de novo
+REPLICA_RETRY_AFTER = int(os.getenv("REPLICA_RETRY_AFTER", "30"))
+
+# Timeout (s) de conexão com réplica (Postgres)
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+
+# Intervalo (s) entre pings de saúde de cada réplica
+REPLICA_CHECK_INTERVAL = int(os.getenv("REPLICA_CHECK_INTERVAL", "10"))
+
+# Postgres: messages particionada por mês (created_at). Em SQLite vira tabela normal.
+PARTITION_MESSAGES = os.getenv("PARTITION_MESSAGES", "1") != "0"
+
+# Quantos meses à frente já deixar as partições criadas
+PARTITION_MONTHS_AHEAD = 2
+
+# Postgres: "updated partition constraint for default partition would be violated"
+_PG_CHECK_VIOLATION = "23514"
+
+log = logging.getLogger(__name__)
 
 engine = create_engine(
     DB_URL,
     pool_pre_ping=True,   # evita conexão morta após sleep do Render
 )
 
+
+
+# =========================
+# RÉPLICAS (leitura)
+# =========================
+
+def _replica_engine(url: str):
+    # timeout curto: réplica inacessível custa no máximo isso antes do fallback
+    connect_args = {"connect_timeout": REPLICA_CONNECT_TIMEOUT} if url.startswith("postgresql") else {}
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
+
+replica_engines = [_replica_engine(u) for u in REPLICA_URLS]
+
+_replica_lock = threading.Lock()
+_replica_down_until = {}          # engine -> timestamp
+_replica_checked_at = {}          # engine -> último ping ok
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+
+def has_replicas() -> bool:
+    return bool(replica_engines)
+
+
+def mark_replica_down(eng):
+    with _replica_lock:
+        _replica_down_until[eng] = time.time() + REPLICA_RETRY_AFTER
+        _replica_checked_at.pop(eng, None)
+
+
+def _replica_ok(eng) -> bool:
+    now = time.time()
+    if _replica_down_until.get(eng, 0) > now:
+        return False
+    if now - _replica_checked_at.get(eng, 0) < REPLICA_CHECK_INTERVAL:
+        return True
+
+    # ping barato de tempos em tempos: réplica fora nem chega a receber a query
+    try:
+        with eng.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        mark_replica_down(eng)
+        return False
+
+    with _replica_lock:
+        _replica_down_until.pop(eng, None)
+        _replica_checked_at[eng] = now
+    return True
+
+
+def pick_read_engine():
+    """Próxima réplica saudável (round-robin); sem nenhuma, o primário."""
+    for _ in range(len(replica_engines)):
+        with _replica_lock:
+            eng = next(_replica_cycle)
+        if _replica_ok(eng):
+            return eng
+    return engine
+
+
+def _on_replica_error(ctx):
+    # conexão caiu (ou nem abriu): tira a réplica do rodízio
+    if ctx.is_disconnect or ctx.connection is None:
+        mark_replica_down(ctx.engine)
+
+
+for _eng in replica_engines:
+    event.listen(_eng, "handle_error", _on_replica_error)
+
+
+class RoutingSession(Session):
+    """
+    Sessão que manda leitura pra réplica quando criada com read_only.
+    Qualquer flush (escrita) sempre vai pro primário.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("read_only") and not self._flushing:
+            if "read_engine" not in self.info:
+                # fixa a réplica pela sessão toda (leituras consistentes entre si)
+                self.info["read_engine"] = pick_read_engine()
+            return self.info["read_engine"]
+        return engine
+
+    def execute(self, *args, **kw):
+        # Query/get/lazy load passam todos por aqui
+        try:
+            return super().execute(*args, **kw)
+        except DBAPIError:
+            eng = self.info.get("read_engine")
+            if not self.info.get("read_only") or eng is None or eng is engine:
+                raise
+
+            # réplica caiu entre um ping e outro: tira do rodízio e refaz no primário
+            mark_replica_down(eng)
+            self.rollback()
+            self.info["read_engine"] = engine
+            return super().execute(*args, **kw)
+
+
 SessionLocal = sessionmaker(
-    bind=engine,
+    class_=RoutingSession,
     autoflush=False,
     autocommit=False
 )
 
+
+def ReadSessionLocal():
+    """Sessão só de leitura: usa réplica se houver (ver DATABASE_REPLICA_URLS)."""
+    return SessionLocal(info={"read_only": True})
+
 Base = declarative_base()
 
 
@@ -83,10 +233,20 @@ class Chat(Base):
         back_populates="chat",
         cascade="all, delete-orphan"
     )
+    archive = relationship(
+        "ArchivedChat",
+        back_populates="chat",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
 
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # histórico de um chat (GET /chats/<id>/messages e POST /chat)
+        Index("ix_messages_chat_created", "chat_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=False)
@@ -97,5 +257,160 @@ class Message(Base):
     chat = relationship("Chat", back_populates="messages")
 
 
+class ArchivedChat(Base):
+    """
+    Cold store: mensagens de um chat inativo, em JSON comprimido (gzip).
+    Volta pra `messages` quando o chat é aberto de novo (ver archive.py).
+    """
+    __tablename__ = "archived_chats"
+
+    chat_id = Column(Integer, ForeignKey("chats.id"), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)
+    message_count = Column(Integer, nullable=False)
+    last_message_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    chat = relationship("Chat", back_populates="archive")
+
+
+class ChatRequest(Base):
+    """
+    Registro de idempotência do POST /chat (ver idempotency.py).
+    Fica no banco pra valer entre workers e instâncias: insert duplicado na
+    mesma chave = requisição já em andamento ou concluída.
+    """
+    __tablename__ = "chat_requests"
+
+    key = Column(String(64), primary_key=True)
+    body_hash = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False)   # pending | done
+    payload = Column(Text, nullable=True)         # JSON da resposta
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+# =========================
+# PARTIÇÕES (Postgres)
+# =========================
+
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def messages_partitioned() -> bool:
+    if not _is_postgres():
+        return False
+    with engine.connect() as conn:
+        kind = conn.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = 'messages' AND relkind IN ('r', 'p')")
+        ).scalar()
+    return kind == "p"
+
+
+def _create_partitioned_messages():
+    # PK precisa incluir a chave de partição
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE messages (
+                id SERIAL,
+                chat_id INTEGER NOT NULL REFERENCES chats(id),
+                role VARCHAR(20) NOT NULL,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """))
+        # rede de segurança: linha sem partição do mês (ex: chat reidratado antigo)
+        conn.execute(text("CREATE TABLE messages_default PARTITION OF messages DEFAULT"))
+
+
+def _add_months(d: datetime, n: int) -> datetime:
+    m = d.month - 1 + n
+    return d.replace(year=d.year + m // 12, month=m % 12 + 1)
+
+
+def ensure_message_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """Cria a partição do mês atual e dos próximos meses (idempotente)."""
+    if not messages_partitioned():
+        return
+
+    inicio = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for i in range(months_ahead + 1):
+        de = _add_months(inicio, i)
+        ate = _add_months(inicio, i + 1)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS messages_{de:%Y_%m} PARTITION OF messages "
+                    f"FOR VALUES FROM ('{de:%Y-%m-%d}') TO ('{ate:%Y-%m-%d}')"
+                ))
+        except DBAPIError as e:
+            if getattr(e.orig, "pgcode", None) == _PG_CHECK_VIOLATION:
+                # já existem linhas desse mês na partição default: continuam lá
+                log.warning("partição messages_%s não criada: mês já tem linhas na default", f"{de:%Y_%m}")
+                continue
+            log.exception("falha criando partição messages_%s", f"{de:%Y_%m}")
+
+
+def drop_empty_partitions(before: datetime) -> int:
+    """
+    Remove partições mensais que terminam antes de `before` e estão vazias
+    (todos os chats do mês já foram arquivados). DROP de uma partição inteira
+    não deixa tuplas mortas: o custo de vacuum não cresce com o histórico.
+    Retorna quantas foram removidas.
+    """
+    if not messages_partitioned():
+        return 0
+
+    with engine.connect() as conn:
+        nomes = conn.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = 'messages'
+        """)).scalars().all()
+
+    removidas = 0
+    for nome in nomes:
+        m = re.fullmatch(r"messages_(\d{4})_(\d{2})", nome)
+        if not m:
+            continue  # messages_default fica sempre
+        fim = _add_months(datetime(int(m.group(1)), int(m.group(2)), 1), 1)
+        if fim > before:
+            continue
+
+        try:
+            with engine.begin() as conn:
+                # trava pai e partição (mesma ordem de um INSERT): nada entra
+                # (ex: reidratação) entre checar e remover. lock_timeout curto
+                # pra não enfileirar o tráfego do chat atrás do job.
+                conn.execute(text("SET LOCAL lock_timeout = '2s'"))
+                conn.execute(text(f"LOCK TABLE messages, {nome} IN ACCESS EXCLUSIVE MODE"))
+                tem_linhas = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {nome})")).scalar()
+                if tem_linhas:
+                    continue
+                conn.execute(text(f"ALTER TABLE messages DETACH PARTITION {nome}"))
+                conn.execute(text(f"DROP TABLE {nome}"))
+            removidas += 1
+        except DBAPIError:
+            # lock_timeout etc: tenta de novo na próxima rodada
+            log.exception("falha removendo partição %s", nome)
+
+    # chat antigo reidratado depois disso cai na partição default
+    return removidas
+
+
 def init_db():
+    # Postgres novo: cria messages já particionada. Tabela antiga (não
+    # particionada) continua funcionando como está.
+    if _is_postgres() and PARTITION_MESSAGES and not inspect(engine).has_table("messages"):
+        Base.metadata.create_all(bind=engine, tables=[User.__table__, Chat.__table__])
+        _create_partitioned_messages()
+
     Base.metadata.create_all(bind=engine)
+
+    # create_all não cria índice em tabela que já existia
+    for idx in Message.__table__.indexes:
+        idx.create(bind=engine, checkfirst=True)
+
+    ensure_message_partitions()
@@ -0,0 +1,146 @@
+# idempotency.py
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from db import SessionLocal, ChatRequest
+
+# Quanto tempo (s) um resultado concluído fica disponível pra replay
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "120"))
+
+# Janela (s) usada pra derivar a chave quando o cliente não manda uma
+IDEMPOTENCY_WINDOW = int(os.getenv("IDEMPOTENCY_WINDOW", "30"))
+
+# Quanto tempo (s) uma repetição espera a original terminar antes de desistir
+IDEMPOTENCY_WAIT = int(os.getenv("IDEMPOTENCY_WAIT", "30"))
+
+# Registro "pending" mais velho que isso (s) é de um worker que morreu: pode refazer
+IDEMPOTENCY_STALE = int(os.getenv("IDEMPOTENCY_STALE", "300"))
+
+_POLL_INTERVAL = 0.25
+
+_last_purge = 0.0
+
+
+def make_key(uid: int, chat_id: Any, msg: str, client_key: Optional[str] = None) -> str:
+    """
+    Chave de idempotência do POST /chat.
+    - client_key: enviada pelo navegador (header Idempotency-Key ou campo request_id)
+    - sem client_key: deriva de chat_id + mensagem + janela de tempo
+    Sempre inclui o usuário, pra um não conseguir "reaproveitar" a resposta do outro.
+    """
+    if client_key:
+        base = f"{uid}|k|{client_key.strip()[:200]}"
+    else:
+        janela = int(time.time() // IDEMPOTENCY_WINDOW)
+        base = f"{uid}|{chat_id}|{msg}|{janela}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def body_hash(chat_id: Any, msg: str) -> str:
+    """Hash do corpo: mesma chave com corpo diferente é erro (422), não replay."""
+    return hashlib.sha256(f"{chat_id}|{msg}".encode("utf-8")).hexdigest()
+
+
+def _purge(db):
+    # no máximo uma vez por minuto por processo; DELETE usa o índice de created_at
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < 60:
+        return
+    _last_purge = now
+
+    limite = datetime.utcnow() - timedelta(seconds=max(IDEMPOTENCY_TTL, IDEMPOTENCY_STALE))
+    db.query(ChatRequest).filter(ChatRequest.created_at < limite).delete(synchronize_session=False)
+    db.commit()
+
+
+def _claim(db, key: str, fingerprint: str) -> Optional[ChatRequest]:
+    """
+    Tenta registrar a chave como "pending". None = conseguiu (somos o dono);
+    senão devolve o registro que já existia.
+    """
+    while True:
+        db.add(ChatRequest(key=key, body_hash=fingerprint, status="pending"))
+        try:
+            db.commit()
+            return None
+        except IntegrityError:
+            db.rollback()
+
+        row = db.query(ChatRequest).filter(ChatRequest.key == key).first()
+        if row is None:
+            # sumiu entre o insert e o select (expirou/falhou): tenta de novo
+            continue
+
+        idade = (datetime.utcnow() - row.created_at).total_seconds()
+        vencido = (
+            (row.status == "done" and idade > IDEMPOTENCY_TTL)
+            or (row.status == "pending" and idade > IDEMPOTENCY_STALE)
+        )
+        if not vencido:
+            return row
+
+        db.delete(row)
+        db.commit()
+
+
+def _wait_done(db, key: str) -> Optional[ChatRequest]:
+    deadline = time.time() + IDEMPOTENCY_WAIT
+    while time.time() < deadline:
+        time.sleep(_POLL_INTERVAL)
+        db.expire_all()
+        row = db.query(ChatRequest).filter(ChatRequest.key == key).first()
+        if row is None or row.status == "done":
+            return row
+    return None
+
+
+def run_once(key: str, fingerprint: str, fn: Callable[[], Tuple[Any, int]]) -> Tuple[Any, int]:
+    """
+    Executa fn() uma única vez por chave, entre todos os workers/instâncias.
+    - repetição com fn em andamento: espera até IDEMPOTENCY_WAIT e devolve o
+      mesmo resultado (ou 409 se não terminou a tempo)
+    - repetição após concluir (dentro do TTL): devolve o resultado guardado
+    - mesma chave com outro corpo: 422
+    fn deve retornar (payload, status). Só status 200 fica guardado pra replay.
+    """
+    db = SessionLocal()
+    try:
+        _purge(db)
+
+        row = _claim(db, key, fingerprint)
+        if row is not None:
+            if row.body_hash != fingerprint:
+                return {"error": "Idempotency-Key já usada com outra mensagem"}, 422
+
+            if row.status == "pending":
+                row = _wait_done(db, key)
+                if row is None:
+                    # ainda rodando (ou a original falhou e liberou a chave)
+                    return {"error": "requisição em andamento, tente de novo"}, 409
+
+            return json.loads(row.payload), 200
+
+        result = None
+        try:
+            result = fn()
+        finally:
+            row = db.query(ChatRequest).filter(ChatRequest.key == key).first()
+            if row is not None:
+                if result is not None and result[1] == 200:
+                    row.status = "done"
+                    row.payload = json.dumps(result[0], ensure_ascii=False)
+                else:
+                    # erro: libera a chave pra próxima tentativa refazer
+                    db.delete(row)
+                db.commit()
+
+        return result
+    finally:
+        db.close()
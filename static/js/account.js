@@ -0,0 +1,160 @@
+/* static/js/account.js */
+async function api(url, options = {}) {
+  const res = await fetch(url, options);
+  const txt = await res.text();
+  let data = {};
+  try { data = txt ? JSON.parse(txt) : {}; } catch { data = {}; }
+  if (!res.ok) throw new Error(data.error || `HTTP ${res.status}`);
+  return data;
+}
+
+function toast(el, kind, msg) {
+  el.className = "toast " + kind;
+  el.textContent = msg;
+  el.style.display = "block";
+  setTimeout(() => { el.style.display = "none"; }, 3500);
+}
+
+const userNameEl = document.getElementById("userName");
+const pillEmailEl = document.getElementById("pillEmail");
+
+const nameEl = document.getElementById("name");
+const ageEl = document.getElementById("age");
+const emailEl = document.getElementById("email");
+const contextEl = document.getElementById("context");
+const goalEl = document.getElementById("goal");
+
+const toastProfile = document.getElementById("toastProfile");
+const toastPass = document.getElementById("toastPass");
+const toastDelete = document.getElementById("toastDelete");
+
+async function loadMe() {
+  try {
+    const me = await api("/auth/me");
+    const u = me.user || {};
+    const nm = u.name || "Usuário";
+
+    userNameEl.textContent = nm;
+    userNameEl.title = nm;
+
+    nameEl.value = u.name || "";
+    ageEl.value = (u.age ?? "") === null ? "" : (u.age ?? "");
+    emailEl.value = u.email || "";
+
+    // pill com email mascarado
+    const email = (u.email || "").trim();
+    if (email) {
+      const [a, b] = email.split("@");
+      const masked = (a || "").slice(0, 2) + "***@" + (b || "");
+      pillEmailEl.textContent = "email: " + masked;
+    } else {
+      pillEmailEl.textContent = "email: --";
+    }
+
+    contextEl.value = u.context || "";
+    goalEl.value = u.goal || "";
+  } catch {
+    window.location.href = "/login";
+  }
+}
+
+// PERFIL
+document.getElementById("saveProfile").addEventListener("click", async () => {
+  const payload = {
+    name: nameEl.value.trim(),
+    age: ageEl.value.trim(),
+    context: contextEl.value.trim(),
+    goal: goalEl.value.trim(),
+  };
+
+  try {
+    await api("/account/profile", {
+      method: "PUT",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload)
+    });
+
+    toast(toastProfile, "ok", "Perfil salvo ✅");
+    // atualiza topo
+    userNameEl.textContent = payload.name || "Usuário";
+    userNameEl.title = payload.name || "Usuário";
+  } catch (e) {
+    toast(toastProfile, "err", "Não rolou salvar 😔 " + (e.message || e));
+  }
+});
+
+// TROCAR SENHA
+document.getElementById("changePass").addEventListener("click", async () => {
+  const current = document.getElementById("currentPass").value.trim();
+  const np = document.getElementById("newPass").value.trim();
+  const np2 = document.getElementById("newPass2").value.trim();
+
+  if (!current || !np || !np2) {
+    toast(toastPass, "err", "Preenche tudo aí 🙂");
+    return;
+  }
+  if (np !== np2) {
+    toast(toastPass, "err", "As senhas novas não batem 😅");
+    return;
+  }
+
+  try {
+    await api("/account/password", {
+      method: "PUT",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ current_password: current, new_password: np })
+    });
+
+    document.getElementById("currentPass").value = "";
+    document.getElementById("newPass").value = "";
+    document.getElementById("newPass2").value = "";
+
+    toast(toastPass, "ok", "Senha trocada ✅");
+  } catch (e) {
+    toast(toastPass, "err", "Não rolou trocar 😔 " + (e.message || e));
+  }
+});
+
+// LOGOUT (2 botões)
+async function logout() {
+  try { await api("/auth/logout", { method: "POST" }); } catch { }
+  localStorage.removeItem("chat_id");
+  localStorage.removeItem("user_id");
+  localStorage.removeItem("user_name");
+  window.location.href = "/login";
+}
+
+document.getElementById("logoutBtn").addEventListener("click", logout);
+document.getElementById("logoutBtn2").addEventListener("click", logout);
+
+// DELETE ACCOUNT
+document.getElementById("deleteBtn").addEventListener("click", async () => {
+  const conf = document.getElementById("deleteConfirm").value.trim();
+  const pass = document.getElementById("deletePass").value.trim();
+
+  if (conf !== "DELETE") {
+    toast(toastDelete, "err", "Digita DELETE certinho aí 😅");
+    return;
+  }
+  if (!pass) {
+    toast(toastDelete, "err", "Falta sua senha atual 🙂");
+    return;
+  }
+
+  if (!confirm("Última chance: apagar conta apaga tudo. Confirma?")) return;
+
+  try {
+    await api("/account", {
+      method: "DELETE",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ password: pass })
+    });
+
+    await logout();
+  } catch (e) {
+    toast(toastDelete, "err", "Não rolou apagar 😔 " + (e.message || e));
+  }
+});
+
+// init
+loadMe();
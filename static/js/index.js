@@ -0,0 +1,305 @@
+/* static/js/index.js */
+const messagesEl = document.getElementById("messages");
+const inputEl = document.getElementById("msgInput");
+const sendBtn = document.getElementById("sendBtn");
+
+const chatListEl = document.getElementById("chatList");
+const newChatBtn = document.getElementById("newChatBtn");
+const userNameEl = document.getElementById("userName");
+const logoutBtn = document.getElementById("logoutBtn");
+
+// ✅ NOVO: botão conta/configurações
+const accountBtn = document.getElementById("accountBtn");
+accountBtn?.addEventListener("click", () => {
+    window.location.href = "/account";
+});
+
+// drawer
+const menuBtn = document.getElementById("menuBtn");
+const overlay = document.getElementById("overlay");
+
+function openSidebar() { document.body.classList.add("sidebar-open"); }
+function closeSidebar() { document.body.classList.remove("sidebar-open"); }
+function toggleSidebar() { document.body.classList.toggle("sidebar-open"); }
+
+menuBtn?.addEventListener("click", toggleSidebar);
+overlay?.addEventListener("click", closeSidebar);
+
+function closeSidebarIfMobile() {
+    if (window.matchMedia("(max-width: 900px)").matches) closeSidebar();
+}
+
+let chatId = localStorage.getItem("chat_id");
+
+let audioQueue = [];
+let playing = false;
+
+function addMsg(role, htmlOrText) {
+    const div = document.createElement("div");
+    div.className = "msg " + role;
+    if (role === "bot") div.innerHTML = htmlOrText;
+    else div.textContent = htmlOrText;
+    messagesEl.appendChild(div);
+    messagesEl.scrollTop = messagesEl.scrollHeight;
+}
+
+function clearMsgs() { messagesEl.innerHTML = ""; }
+
+async function api(url, options = {}) {
+    const res = await fetch(url, options);
+    const txt = await res.text();
+    let data = {};
+    try { data = txt ? JSON.parse(txt) : {}; } catch { data = {}; }
+
+    if (!res.ok) throw new Error(data.error || `HTTP ${res.status}`);
+    return data;
+}
+
+async function playNextAudio() {
+    if (playing || audioQueue.length === 0) return;
+
+    playing = true;
+    const item = audioQueue.shift();
+
+    try {
+        const audio = new Audio(item.url);
+        await audio.play();
+        audio.addEventListener("ended", async () => {
+            playing = false;
+            try { await fetch(item.deleteUrl, { method: "DELETE" }); } catch { }
+            playNextAudio();
+        });
+    } catch {
+        playing = false;
+    }
+}
+
+function fecharMenu() {
+    document.querySelectorAll(".context-menu").forEach(m => m.remove());
+}
+
+function abrirMenuChat(x, y, chatIdMenu, currentTitle) {
+    fecharMenu();
+
+    const menu = document.createElement("div");
+    menu.className = "context-menu";
+    menu.style.left = x + "px";
+    menu.style.top = y + "px";
+
+    const rename = document.createElement("button");
+    rename.textContent = "Renomear";
+    rename.onclick = async () => {
+        const novo = prompt("Novo nome do chat:", currentTitle);
+        if (!novo) return;
+
+        try {
+            await api(`/chats/${chatIdMenu}`, {
+                method: "PUT",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ title: novo })
+            });
+        } catch (e) {
+            alert("Não consegui renomear 😔\n" + String(e.message || e));
+        }
+
+        fecharMenu();
+        await carregarChats();
+    };
+
+    const del = document.createElement("button");
+    del.textContent = "Deletar";
+    del.onclick = async () => {
+        if (!confirm("Tem certeza que quer deletar esse chat?")) return;
+
+        try {
+            await api(`/chats/${chatIdMenu}`, { method: "DELETE" });
+        } catch (e) {
+            alert("Não consegui deletar 😔\n" + String(e.message || e));
+            fecharMenu();
+            return;
+        }
+
+        if (String(chatIdMenu) === String(chatId)) {
+            chatId = null;
+            localStorage.removeItem("chat_id");
+            clearMsgs();
+            mensagemInicial();
+        }
+
+        fecharMenu();
+        await carregarChats();
+    };
+
+    menu.append(rename, del);
+    document.body.appendChild(menu);
+
+    setTimeout(() => {
+        document.addEventListener("click", fecharMenu, { once: true });
+    }, 0);
+}
+
+function mensagemInicial() {
+    addMsg("bot",
+        "<b>Oi! Eu sou a Maggie 😊</b><br>" +
+        "Me conta: o que tá te deixando mais perdido agora?<hr>" +
+        "<i>Tô aqui pra te ouvir.</i>"
+    );
+}
+
+function renderChatList(chats) {
+    chatListEl.innerHTML = "";
+
+    chats.forEach(c => {
+        const btn = document.createElement("button");
+        btn.className = "chat-item" + (String(c.id) === String(chatId) ? " active" : "");
+        btn.textContent = c.title || `Chat #${c.id}`;
+
+        btn.onclick = async () => {
+            chatId = String(c.id);
+            localStorage.setItem("chat_id", chatId);
+            await carregarMensagensDoChat(chatId);
+            await carregarChats();
+            closeSidebarIfMobile();
+        };
+
+        btn.oncontextmenu = (e) => {
+            e.preventDefault();
+            abrirMenuChat(e.pageX, e.pageY, c.id, btn.textContent);
+        };
+
+        chatListEl.appendChild(btn);
+    });
+}
+
+async function carregarChats() {
+    const chats = await api(`/chats`);
+    renderChatList(chats);
+}
+
+async function carregarMensagensDoChat(cid) {
+    clearMsgs();
+    audioQueue = [];
+    playing = false;
+
+    const msgs = await api(`/chats/${cid}/messages`);
+    for (const m of msgs) {
+        addMsg(m.role === "assistant" ? "bot" : "user", m.content);
+    }
+    if (msgs.length === 0) mensagemInicial();
+}
+
+async function criarChatNovo() {
+    const c = await api("/chats", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ title: "Novo chat" })
+    });
+
+    chatId = String(c.chat_id);
+    localStorage.setItem("chat_id", chatId);
+
+    await carregarChats();
+    await carregarMensagensDoChat(chatId);
+    closeSidebarIfMobile();
+}
+
+// envio que falhou (rede caiu etc): se o usuário reenviar o mesmo texto no
+// mesmo chat, reusa a chave e o servidor devolve a resposta que já gerou
+let pendingSend = null;
+
+function chaveEnvio(text) {
+    if (!pendingSend || pendingSend.chatId !== chatId || pendingSend.text !== text) {
+        const key = (crypto.randomUUID && crypto.randomUUID()) || String(Date.now()) + Math.random();
+        pendingSend = { chatId, text, key };
+    }
+    return pendingSend.key;
+}
+
+async function enviar() {
+    const text = inputEl.value.trim();
+    if (!text) return;
+
+    if (!chatId) await criarChatNovo();
+
+    addMsg("user", text);
+    inputEl.value = "";
+
+    const typing = document.createElement("div");
+    typing.className = "msg bot";
+    typing.innerHTML = "<i>Maggie tá pensando…</i>";
+    messagesEl.appendChild(typing);
+    messagesEl.scrollTop = messagesEl.scrollHeight;
+
+    try {
+        const requestId = chaveEnvio(text);
+        const data = await api("/chat", {
+            method: "POST",
+            headers: { "Content-Type": "application/json", "Idempotency-Key": requestId },
+            body: JSON.stringify({ message: text, chat_id: chatId })
+        });
+
+        // resposta chegou: próximo envio (mesmo com texto igual) é mensagem nova
+        pendingSend = null;
+
+        typing.remove();
+        addMsg("bot", data.text);
+
+        if (data.audio) {
+            const nome = data.audio.split("/").pop();
+            audioQueue.push({ url: data.audio, deleteUrl: `/audio/${nome}/delete` });
+            playNextAudio();
+        }
+
+        await carregarChats();
+    } catch (e) {
+        typing.remove();
+        addMsg("bot", "<i>Erro ao conectar com o servidor 😔</i><hr>" + String(e.message || e));
+    }
+}
+
+logoutBtn.onclick = async () => {
+    try { await api("/auth/logout", { method: "POST" }); } catch { }
+    localStorage.removeItem("chat_id");
+    localStorage.removeItem("user_id");
+    localStorage.removeItem("user_name");
+    window.location.href = "/login";
+};
+
+newChatBtn.addEventListener("click", criarChatNovo);
+sendBtn.addEventListener("click", enviar);
+inputEl.addEventListener("keydown", (e) => { if (e.key === "Enter") enviar(); });
+
+(async () => {
+    try {
+        const me = await api("/auth/me");
+        const u = me.user || {};
+        const nm = u.name || "Usuário";
+        userNameEl.textContent = nm;
+        userNameEl.title = nm;
+
+        localStorage.setItem("user_id", String(u.id || ""));
+        localStorage.setItem("user_name", nm);
+
+        await carregarChats();
+
+        if (chatId) {
+            try {
+                await carregarMensagensDoChat(chatId);
+            } catch {
+                chatId = null;
+                localStorage.removeItem("chat_id");
+                clearMsgs();
+                mensagemInicial();
+            }
+        } else {
+            mensagemInicial();
+        }
+
+    } catch {
+        window.location.href = "/login";
+    }
+})();
+
+window.addEventListener("resize", () => {
+    messagesEl.scrollTop = messagesEl.scrollHeight;
+});
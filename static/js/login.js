@@ -0,0 +1,196 @@
+/* static/js/login.js */
+async function api(url, options = {}) {
+  const res = await fetch(url, options);
+  const txt = await res.text();
+  let data = {};
+  try { data = txt ? JSON.parse(txt) : {}; } catch { data = {}; }
+  if (!res.ok) throw new Error(data.error || `HTTP ${res.status}`);
+  return data;
+}
+
+// se já tiver sessão, vaza pro chat
+(async () => {
+  try {
+    await api("/auth/me");
+    window.location.href = "/";
+  } catch { }
+})();
+
+/* Partículas */
+const canvas = document.getElementById('bgParticles');
+const ctx = canvas.getContext('2d', { alpha: true });
+
+function resize() {
+  canvas.width = window.innerWidth * devicePixelRatio;
+  canvas.height = window.innerHeight * devicePixelRatio;
+  canvas.style.width = window.innerWidth + 'px';
+  canvas.style.height = window.innerHeight + 'px';
+  ctx.setTransform(devicePixelRatio, 0, 0, devicePixelRatio, 0, 0);
+}
+window.addEventListener('resize', resize);
+resize();
+
+const particles = Array.from({ length: 80 }, () => ({
+  x: Math.random() * window.innerWidth,
+  y: Math.random() * window.innerHeight,
+  r: 1 + Math.random() * 2.2,
+  v: 0.6 + Math.random() * 1.6,
+  drift: -0.5 + Math.random() * 1,
+  alpha: 0.18 + Math.random() * 0.25
+}));
+
+function tickParticles() {
+  ctx.clearRect(0, 0, window.innerWidth, window.innerHeight);
+  for (const p of particles) {
+    p.y += p.v;
+    p.x += p.drift * 0.3;
+
+    if (p.y > window.innerHeight + 10) {
+      p.y = -10; p.x = Math.random() * window.innerWidth;
+    }
+    if (p.x < -10) p.x = window.innerWidth + 10;
+    if (p.x > window.innerWidth + 10) p.x = -10;
+
+    ctx.beginPath();
+    ctx.arc(p.x, p.y, p.r, 0, Math.PI * 2);
+    ctx.fillStyle = `rgba(161,26,50,${p.alpha})`;
+    ctx.fill();
+  }
+  requestAnimationFrame(tickParticles);
+}
+tickParticles();
+
+/* Login -> Signup (shake + fumaça) */
+const loginView = document.getElementById('loginView');
+const signupView = document.getElementById('signupView');
+const goSignup = document.getElementById('goSignup');
+const smoke = document.getElementById('smoke');
+
+goSignup.addEventListener('click', () => {
+  loginView.classList.remove('shake');
+  void loginView.offsetWidth;
+  loginView.classList.add('shake');
+
+  smoke.classList.add('show');
+
+  setTimeout(() => {
+    smoke.classList.remove('show');
+    loginView.style.display = 'none';
+    signupView.style.display = 'flex';
+    updateProgress();
+  }, 520);
+});
+
+document.getElementById('backToLogin').addEventListener('click', () => {
+  signupView.style.display = 'none';
+  loginView.style.display = 'block';
+  currentStep = 1;
+  setActiveStep(1, false);
+  updateProgress();
+});
+
+/* Steps */
+const steps = Array.from(document.querySelectorAll('.step'));
+const bar = document.getElementById('bar');
+const stepBadge = document.getElementById('stepBadge');
+let currentStep = 1;
+
+function setActiveStep(step, animateOut = true) {
+  const current = steps.find(s => Number(s.dataset.step) === currentStep);
+  const next = steps.find(s => Number(s.dataset.step) === step);
+  if (!next) return;
+
+  if (animateOut && current) {
+    current.classList.add('stepOutLeft');
+    setTimeout(() => {
+      current.classList.remove('stepOutLeft');
+      current.classList.remove('active');
+      next.classList.add('active');
+    }, 240);
+  } else {
+    steps.forEach(s => s.classList.remove('active'));
+    next.classList.add('active');
+  }
+
+  currentStep = step;
+  updateProgress();
+}
+
+function updateProgress() {
+  stepBadge.textContent = `Passo ${currentStep}/4`;
+  bar.style.width = `${(currentStep / 4) * 100}%`;
+}
+
+document.getElementById('next').addEventListener('click', () => setActiveStep(2));
+document.getElementById('next2').addEventListener('click', () => setActiveStep(3));
+document.getElementById('next3').addEventListener('click', () => setActiveStep(4));
+
+document.getElementById('back').addEventListener('click', () => setActiveStep(1));
+document.getElementById('back2').addEventListener('click', () => setActiveStep(2));
+document.getElementById('back3').addEventListener('click', () => setActiveStep(3));
+
+/* Login */
+document.getElementById('btnLogin').addEventListener('click', async () => {
+  const email = document.getElementById('loginEmail').value.trim();
+  const password = document.getElementById('loginPass').value.trim();
+
+  if (!email || !password) {
+    alert("Preenche email e senha 🙂");
+    return;
+  }
+
+  try {
+    const data = await api("/auth/login", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ email, password })
+    });
+
+    // espelha no localStorage (não é a auth real; a real é o cookie de sessão)
+    localStorage.setItem("user_id", data.user_id);
+    localStorage.setItem("user_name", data.name || "Usuário");
+    localStorage.removeItem("chat_id");
+
+    window.location.href = "/";
+  } catch (e) {
+    alert(e.message || String(e));
+  }
+});
+
+/* Cadastro */
+document.getElementById('finish').addEventListener('click', async () => {
+  if (!document.getElementById('consent').checked) {
+    alert("Marca o 'Entendi' pra concluir 🙂");
+    return;
+  }
+
+  const payload = {
+    name: document.getElementById('name').value.trim(),
+    email: document.getElementById('email').value.trim(),
+    password: document.getElementById('pass').value.trim(),
+    age: document.getElementById('age').value.trim(),
+    context: document.getElementById('context').value.trim(),
+    goal: document.getElementById('goal').value.trim(),
+  };
+
+  if (!payload.name || !payload.email || !payload.password) {
+    alert("Nome, email e senha são obrigatórios 🙂");
+    return;
+  }
+
+  try {
+    const data = await api("/auth/signup", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload)
+    });
+
+    localStorage.setItem("user_id", data.user_id);
+    localStorage.setItem("user_name", data.name || payload.name || "Usuário");
+    localStorage.removeItem("chat_id");
+
+    window.location.href = "/";
+  } catch (e) {
+    alert(e.message || String(e));
+  }
+});
@@ -1,20 +1,27 @@
 import edge_tts
 import uuid
 import os
+import tempfile
 
-AUDIO_DIR = "audios"
+from audio_storage import storage
 
 
 async def gerar_audio(texto: str) -> str:
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-
     nome = f"{uuid.uuid4()}.wav"
-    caminho = os.path.join(AUDIO_DIR, nome)
+
+    # gera num temp local e depois manda pro storage (local, compartilhado ou s3)
+    fd, caminho = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
 
     communicate = edge_tts.Communicate(
         texto,
         "pt-BR-FranciscaNeural"
     )
 
-    await communicate.save(caminho)
+    try:
+        await communicate.save(caminho)
+        storage.put_file(nome, caminho)
+    finally:
+        if os.path.exists(caminho):
+            os.remove(caminho)
     return nome